@@ -0,0 +1,47 @@
+"""
+Shared pytest configuration for the GaddisAI test scripts.
+
+The test_*.py files double as standalone scripts. In test_system.py the
+check_* functions return True/False for its main() and thin test_*
+wrappers assert on them; those system tests are independent and can run
+in parallel with pytest-xdist:
+
+    pytest -n 4 test_system.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+# Config files parsed by most tests
+CONFIG_FILES = ("./config/roles.yaml", "./config/retrieval.yaml")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_config_cache():
+    """Parse shared config files once per session (per worker under xdist)."""
+    from utils import yaml_cache
+
+    for path in CONFIG_FILES:
+        if os.path.exists(path):
+            yaml_cache.load(path)
+
+
+@pytest.fixture(scope="session")
+def vectorstore():
+    """VectorStore shared by every test in the session."""
+    from test_system import build_vectorstore
+    return build_vectorstore()
+
+
+@pytest.fixture(scope="session")
+def ingester():
+    """DocumentIngester shared by every test in the session."""
+    from test_system import build_ingester
+    return build_ingester()
+
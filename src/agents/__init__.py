@@ -1,7 +1,25 @@
 """Agent classes for GaddisAI NSC simulation."""
 
-from .base_agent import NSCAgent
-from .advisor_agent import AdvisorAgent
-from .president_agent import PresidentAgent
+import importlib
 
 __all__ = ["NSCAgent", "AdvisorAgent", "PresidentAgent"]
+
+# Submodules are imported on first attribute access (PEP 562), so importing
+# the package doesn't load the OpenAI client until an agent is needed
+_LAZY = {
+    "NSCAgent": ".base_agent",
+    "AdvisorAgent": ".advisor_agent",
+    "PresidentAgent": ".president_agent",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
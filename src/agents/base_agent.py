@@ -5,9 +5,10 @@ Base agent class for GaddisAI NSC simulation.
 import os
 from pathlib import Path
 from typing import Dict, List, Optional
-import yaml
 from openai import OpenAI
 
+from utils import config_bundle, yaml_cache
+
 
 class NSCAgent:
     """Base class for NSC principals (advisors and President)."""
@@ -32,14 +33,16 @@ class NSCAgent:
         self.model = model
         self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 
-        # Load dossier
-        with open(dossier_path, 'r') as f:
-            self.dossier = yaml.safe_load(f)
+        # Load dossier, preferring the pre-parsed bundle when it is current
+        self.dossier = config_bundle.get_dossier(role, dossier_path)
+        if self.dossier is None:
+            self.dossier = yaml_cache.load(dossier_path)
 
         # Load role configuration
-        with open(roles_config_path, 'r') as f:
-            roles_config = yaml.safe_load(f)
-            self.role_config = roles_config.get(role, {})
+        roles_config = config_bundle.get_config(roles_config_path)
+        if roles_config is None:
+            roles_config = yaml_cache.load(roles_config_path)
+        self.role_config = roles_config.get(role, {})
 
         # Extract key attributes
         self.person = self.dossier.get("person", "Unknown")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+CLI tool to pre-parse config and dossier YAML files into one pickled bundle.
+
+Run after installing or after editing configs/dossiers; agents fall back
+to parsing YAML whenever the bundle is missing or out of date.
+
+Usage:
+    python src/compile_configs.py
+"""
+
+import argparse
+
+from utils.config_bundle import BUNDLE_PATH, compile_bundle
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile config and dossier YAML files into a pickled bundle"
+    )
+    parser.add_argument(
+        "--config-dir",
+        default="./config",
+        help="Directory of config YAML files (default: ./config)"
+    )
+    parser.add_argument(
+        "--dossier-dir",
+        default="./data/dossiers",
+        help="Directory of dossier YAML files (default: ./data/dossiers)"
+    )
+    parser.add_argument(
+        "--output",
+        default=BUNDLE_PATH,
+        help=f"Bundle path (default: {BUNDLE_PATH})"
+    )
+
+    args = parser.parse_args()
+
+    bundle = compile_bundle(args.config_dir, args.dossier_dir, args.output)
+    print(f"✓ Compiled {len(bundle['configs'])} config(s) and "
+          f"{len(bundle['dossiers'])} dossier(s) into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
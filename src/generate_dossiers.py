@@ -69,7 +69,8 @@ def generate_all_dossiers(output_dir: Path, refresh: bool = False, model: str =
             dossier = generate_dossier(
                 role=config["role"],
                 person=config["person"],
-                model=model
+                model=model,
+                refresh=refresh
             )
 
             # Save to file
@@ -106,7 +107,7 @@ def generate_single_dossier(
     print(f"🔍 Researching {role} ({person})...")
 
     try:
-        dossier = generate_dossier(role=role, person=person, model=model)
+        dossier = generate_dossier(role=role, person=person, model=model, refresh=refresh)
 
         with open(output_file, "w") as f:
             yaml.dump(dossier, f, default_flow_style=False, sort_keys=False)
@@ -133,7 +134,7 @@ def main():
     parser.add_argument(
         "--refresh",
         action="store_true",
-        help="Overwrite existing dossier files"
+        help="Overwrite existing dossier files, bypassing the dossier cache"
     )
     parser.add_argument(
         "--output-dir",
@@ -1,7 +1,25 @@
 """RAG system components for GaddisAI."""
 
-from .vectorstore import VectorStore
-from .ingest import DocumentIngester
-from .retriever import ContextRetriever
+import importlib
 
 __all__ = ["VectorStore", "DocumentIngester", "ContextRetriever"]
+
+# Submodules are imported on first attribute access (PEP 562), so importing
+# one component doesn't pull in the dependencies of the others
+_LAZY = {
+    "VectorStore": ".vectorstore",
+    "DocumentIngester": ".ingest",
+    "ContextRetriever": ".retriever",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
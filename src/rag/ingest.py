@@ -4,36 +4,102 @@ Processes and chunks documents from data directory into vector store.
 """
 
 import os
+import re
+import bisect
+import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple
+import tiktoken
 import yaml
-from datetime import datetime
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+from utils import yaml_cache
+from .ingest_cache import DEFAULT_CACHE_DIR, IngestCache
+
+# Bump whenever chunking or dossier sectioning changes to invalidate cached chunks
+CHUNK_FORMAT_VERSION = 1
 
 
 class DocumentIngester:
     """Handles document chunking and ingestion into vector store."""
 
-    def __init__(self, config_path: str, data_dir: str = "./data"):
+    # Characters that mark a preferred chunk break (sentence end or line end)
+    _BOUNDARY_RE = re.compile(r'[.\n]')
+
+    def __init__(
+        self,
+        config_path: str,
+        data_dir: str = "./data",
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR
+    ):
         """
         Initialize document ingester.
 
         Args:
             config_path: Path to retrieval.yaml configuration
             data_dir: Root data directory
+            cache_dir: Directory for cached per-file results (None disables caching)
         """
         self.data_dir = Path(data_dir)
 
         # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = yaml_cache.load(config_path)
 
         self.chunk_tokens = self.config.get("chunk_tokens", 700)
         self.chunk_overlap = self.config.get("chunk_overlap", 120)
+        self.normalize_doctrine_yaml = self.config.get("normalize_doctrine_yaml", False)
+        self.embed_model = self.config.get("embed_model", "text-embedding-3-small")
+
+        self._cache = IngestCache(cache_dir) if cache_dir else None
+        # Cache keys used since the last eviction
+        self._cache_keys = set()
+
+    @cached_property
+    def _encoding(self):
+        """Tokenizer for the embedding model, loaded on first use, or None if unavailable."""
+        return self._load_encoding(self.embed_model)
+
+    @cached_property
+    def _cache_settings(self) -> str:
+        """Everything besides file content that changes the chunks produced."""
+        return "|".join(str(setting) for setting in (
+            CHUNK_FORMAT_VERSION,
+            self.chunk_tokens,
+            self.chunk_overlap,
+            self.normalize_doctrine_yaml,
+            self._encoding.name if self._encoding else None,
+        ))
+
+    @staticmethod
+    def _load_encoding(model_name: str):
+        """Load the tokenizer for the embedding model, or None if unavailable."""
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except Exception as e:
+            # tiktoken downloads its BPE tables on first use, which can fail offline
+            print(f"Warning: tokenizer for {model_name} unavailable ({type(e).__name__}); "
+                  "approximating 4 characters per token")
+            return None
+
+    def _token_offsets(self, text: str) -> Sequence[int]:
+        """Character offset at which each token of text starts."""
+        if self._encoding is None:
+            # Approximate: 1 token ≈ 4 characters
+            return range(0, len(text), 4)
+
+        tokens = self._encoding.encode(text, disallowed_special=())
+        return self._encoding.decode_with_offsets(tokens)[1]
 
     def _chunk_text(self, text: str, chunk_size: int = None, overlap: int = None) -> List[str]:
         """
-        Chunk text into overlapping segments by approximate token count.
+        Chunk text into overlapping segments by token count.
 
         Args:
             text: Text to chunk
@@ -48,213 +114,319 @@ class DocumentIngester:
         if overlap is None:
             overlap = self.chunk_overlap
 
-        # Approximate: 1 token ≈ 4 characters
-        chars_per_chunk = chunk_size * 4
-        overlap_chars = overlap * 4
+        offsets = self._token_offsets(text)
+        token_count = len(offsets)
+        text_length = len(text)
+
+        # Offsets just past every sentence boundary, found in a single pass
+        boundaries = [m.end() for m in self._BOUNDARY_RE.finditer(text)]
 
-        chunks = []
+        # First pass: compute window offsets without touching the text
+        spans = []
         start = 0
-        text_length = len(text)
 
-        while start < text_length:
-            end = start + chars_per_chunk
-            chunk = text[start:end]
+        while start < token_count:
+            end = start + chunk_size
+            char_start = offsets[start]
+            char_end = offsets[end] if end < token_count else text_length
 
             # Try to break at sentence boundary
-            if end < text_length:
-                last_period = chunk.rfind('.')
-                last_newline = chunk.rfind('\n')
-                break_point = max(last_period, last_newline)
-
-                if break_point > chars_per_chunk * 0.7:  # Only break if >70% through chunk
-                    chunk = chunk[:break_point + 1]
-                    end = start + break_point + 1
+            if end < token_count:
+                idx = bisect.bisect_right(boundaries, char_end) - 1
+                # Only break if >70% through chunk
+                if idx >= 0 and boundaries[idx] - 1 - char_start > (char_end - char_start) * 0.7:
+                    char_end = boundaries[idx]
+                    end = bisect.bisect_left(offsets, char_end)
 
-            chunks.append(chunk.strip())
-            start = end - overlap_chars
+            spans.append((char_start, char_end))
+            start = max(end - overlap, start + 1)
 
-        return chunks
+        # Second pass: slice each window once, dropping whitespace-only chunks
+        chunks = [text[start:end].strip() for start, end in spans]
+        return [chunk for chunk in chunks if chunk]
 
     def _generate_doc_id(self, content: str, metadata: Dict) -> str:
-        """Generate unique ID for document chunk."""
-        id_string = f"{metadata.get('source', '')}_{content[:100]}"
-        return hashlib.md5(id_string.encode()).hexdigest()
+        """Generate unique ID for document chunk from its source and full content."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(metadata.get('source', '').encode())
+        h.update(b'\0')
+        h.update(content.encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def _dedupe(
+        documents: List[str],
+        metadatas: List[Dict],
+        ids: List[str]
+    ) -> Tuple[List[str], List[Dict], List[str]]:
+        """Drop chunks whose ID was already seen, keeping the first occurrence."""
+        seen = set()
+        out_docs, out_metas, out_ids = [], [], []
+        for doc, meta, doc_id in zip(documents, metadatas, ids):
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            out_docs.append(doc)
+            out_metas.append(meta)
+            out_ids.append(doc_id)
+
+        return out_docs, out_metas, out_ids
+
+    def _ingest_file(
+        self,
+        file_path: Path,
+        source_type: str,
+        ingested_at: int,
+        cache_only: bool
+    ) -> Optional[Tuple[List[str], List[Dict], List[str]]]:
+        """
+        Process one source file, reusing a cached result when its content is unchanged.
+
+        Args:
+            file_path: Path to the source file
+            source_type: "memo", "doctrine" or "dossier"
+            ingested_at: Ingestion Unix timestamp to record in metadata
+            cache_only: Return None instead of processing files missing from the cache
 
-    def ingest_memos(self) -> Tuple[List[str], List[Dict], List[str]]:
+        Returns:
+            Tuple of (documents, metadatas, ids), or None if skipped
         """
-        Ingest policy memos from data/memo directory.
+        key = None
+        if self._cache is not None:
+            key = self._cache.key(file_path, f"{self._cache_settings}|{source_type}|{file_path}")
+            self._cache_keys.add(key)
+            cached = self._cache.get(key)
+            if cached is not None:
+                documents, metadatas, ids = cached
+                for metadata in metadatas:
+                    metadata["ingested_at"] = ingested_at
+                return documents, metadatas, ids
+
+        if cache_only:
+            return None
+
+        if source_type == "dossier":
+            result = self._process_dossier_file(file_path, ingested_at)
+        else:
+            result = self._process_text_file(file_path, source_type, ingested_at)
+
+        if key is not None:
+            self._cache.put(key, result)
+        return result
+
+    def _process_text_file(
+        self,
+        file_path: Path,
+        source_type: str,
+        ingested_at: int
+    ) -> Tuple[List[str], List[Dict], List[str]]:
+        """
+        Read one memo or doctrine file and split it into token chunks.
+
+        Args:
+            file_path: Path to the text or YAML file
+            source_type: "memo" or "doctrine"
+            ingested_at: Ingestion Unix timestamp to record in metadata
 
         Returns:
             Tuple of (documents, metadatas, ids)
         """
-        memo_dir = self.data_dir / "memo"
         documents = []
         metadatas = []
         ids = []
 
+        # Raw YAML is already readable text; only re-dump it when asked to
+        content = file_path.read_text(encoding='utf-8')
+        if file_path.suffix == ".yaml" and self.normalize_doctrine_yaml:
+            doctrine_data = yaml.load(content, Loader=SafeLoader)
+            content = yaml.dump(doctrine_data, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
+
+        chunks = self._chunk_text(content)
+
+        # Fields shared by every chunk of this file
+        file_metadata = {
+            "source": file_path.name,
+            "source_type": source_type,
+            "total_chunks": len(chunks),
+            "ingested_at": ingested_at
+        }
+
+        for i, chunk in enumerate(chunks):
+            documents.append(chunk)
+            metadatas.append({**file_metadata, "chunk_index": i})
+            ids.append(self._generate_doc_id(chunk, {"source": file_path.name, "chunk": i}))
+
+        return documents, metadatas, ids
+
+    def _memo_files(self) -> Optional[List[Path]]:
+        """Memo files to ingest, or None if the memo directory is missing."""
+        memo_dir = self.data_dir / "memo"
         if not memo_dir.exists():
             print(f"Warning: {memo_dir} does not exist")
-            return documents, metadatas, ids
+            return None
 
-        for file_path in memo_dir.glob("*.txt"):
-            with open(file_path, 'r') as f:
-                content = f.read()
+        return [
+            Path(entry.path) for entry in os.scandir(memo_dir)
+            if entry.is_file() and entry.name.endswith(".txt")
+        ]
 
-            chunks = self._chunk_text(content)
+    def _doctrine_files(self) -> Optional[List[Path]]:
+        """Doctrine files to ingest, or None if the doctrine directory is missing."""
+        doctrine_dir = self.data_dir / "doctrine"
+        if not doctrine_dir.exists():
+            print(f"Warning: {doctrine_dir} does not exist")
+            return None
 
-            for i, chunk in enumerate(chunks):
-                documents.append(chunk)
-                metadatas.append({
-                    "source": file_path.name,
-                    "source_type": "memo",
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "ingested_at": datetime.now().isoformat()
-                })
-                ids.append(self._generate_doc_id(chunk, {"source": file_path.name, "chunk": i}))
+        # Handle both .txt and .yaml doctrine files
+        return [
+            Path(entry.path) for entry in os.scandir(doctrine_dir)
+            if entry.is_file() and entry.name.endswith((".txt", ".yaml"))
+        ]
 
-        print(f"Ingested {len(documents)} chunks from {len(list(memo_dir.glob('*.txt')))} memos")
+    def _dossier_files(self) -> Optional[List[Path]]:
+        """Dossier files to ingest, or None if the dossier directory is missing."""
+        dossier_dir = self.data_dir / "dossiers"
+        if not dossier_dir.exists():
+            print(f"Warning: {dossier_dir} does not exist")
+            return None
+
+        # Check for nested structure (trump_admin/) vs flat structure
+        trump_admin_dir = dossier_dir / "trump_admin"
+        if trump_admin_dir.exists():
+            dossier_dir = trump_admin_dir
+
+        # Collect dossier files from both flat and nested structures
+
+        # Flat structure: *.yaml files directly in dossier_dir
+        dossier_files = [
+            Path(entry.path) for entry in os.scandir(dossier_dir)
+            if entry.is_file() and entry.name.endswith(".yaml")
+        ]
+
+        # Nested structure: role_dir/profile.yaml
+        dossier_files.extend(dossier_dir.glob("*/profile.yaml"))
+        return dossier_files
+
+    def ingest_memos(self, cache_only: bool = False) -> Tuple[List[str], List[Dict], List[str]]:
+        """
+        Ingest policy memos from data/memo directory.
+
+        Args:
+            cache_only: Only return cached results, skipping uncached files
+
+        Returns:
+            Tuple of (documents, metadatas, ids)
+        """
+        documents = []
+        metadatas = []
+        ids = []
+        ingested_at = int(time.time())
+
+        memo_files = self._memo_files()
+        if memo_files is None:
+            return documents, metadatas, ids
+
+        for file_path in memo_files:
+            result = self._ingest_file(file_path, "memo", ingested_at, cache_only)
+            if result is not None:
+                documents.extend(result[0])
+                metadatas.extend(result[1])
+                ids.extend(result[2])
+
+        print(f"Ingested {len(documents)} chunks from {len(memo_files)} memos")
         return documents, metadatas, ids
 
-    def ingest_doctrine(self) -> Tuple[List[str], List[Dict], List[str]]:
+    def ingest_doctrine(self, cache_only: bool = False) -> Tuple[List[str], List[Dict], List[str]]:
         """
         Ingest doctrine documents from data/doctrine directory.
 
+        Args:
+            cache_only: Only return cached results, skipping uncached files
+
         Returns:
             Tuple of (documents, metadatas, ids)
         """
-        doctrine_dir = self.data_dir / "doctrine"
         documents = []
         metadatas = []
         ids = []
+        ingested_at = int(time.time())
 
-        if not doctrine_dir.exists():
-            print(f"Warning: {doctrine_dir} does not exist")
+        doctrine_files = self._doctrine_files()
+        if doctrine_files is None:
             return documents, metadatas, ids
 
-        # Handle both .txt and .yaml doctrine files
-        file_count = 0
-        for file_path in list(doctrine_dir.glob("*.txt")) + list(doctrine_dir.glob("*.yaml")):
-            file_count += 1
-
-            if file_path.suffix == ".yaml":
-                # Convert YAML to text representation
-                with open(file_path, 'r') as f:
-                    doctrine_data = yaml.safe_load(f)
-                content = yaml.dump(doctrine_data, default_flow_style=False, sort_keys=False)
-            else:
-                # Plain text file
-                with open(file_path, 'r') as f:
-                    content = f.read()
-
-            chunks = self._chunk_text(content)
-
-            for i, chunk in enumerate(chunks):
-                documents.append(chunk)
-                metadatas.append({
-                    "source": file_path.name,
-                    "source_type": "doctrine",
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "ingested_at": datetime.now().isoformat()
-                })
-                ids.append(self._generate_doc_id(chunk, {"source": file_path.name, "chunk": i}))
-
-        print(f"Ingested {len(documents)} chunks from {file_count} doctrine documents")
+        for file_path in doctrine_files:
+            result = self._ingest_file(file_path, "doctrine", ingested_at, cache_only)
+            if result is not None:
+                documents.extend(result[0])
+                metadatas.extend(result[1])
+                ids.extend(result[2])
+
+        print(f"Ingested {len(documents)} chunks from {len(doctrine_files)} doctrine documents")
         return documents, metadatas, ids
 
-    def ingest_dossiers(self) -> Tuple[List[str], List[Dict], List[str]]:
+    def _process_dossier_file(self, file_path: Path, ingested_at: int) -> Tuple[List[str], List[Dict], List[str]]:
         """
-        Ingest agent dossiers from data/dossiers directory.
+        Parse one dossier file and split it into semantic section chunks.
+
+        Args:
+            file_path: Path to dossier YAML file
+            ingested_at: Ingestion Unix timestamp to record in metadata
 
         Returns:
             Tuple of (documents, metadatas, ids)
         """
-        dossier_dir = self.data_dir / "dossiers"
         documents = []
         metadatas = []
         ids = []
 
-        if not dossier_dir.exists():
-            print(f"Warning: {dossier_dir} does not exist")
-            return documents, metadatas, ids
+        dossier = yaml.load(file_path.read_text(encoding='utf-8'), Loader=SafeLoader)
 
-        # Check for nested structure (trump_admin/) vs flat structure
-        trump_admin_dir = dossier_dir / "trump_admin"
-        if trump_admin_dir.exists():
-            dossier_dir = trump_admin_dir
+        # Determine source name (role)
+        if file_path.name == "profile.yaml":
+            source_name = file_path.parent.name  # e.g., "President" from President/profile.yaml
+        else:
+            source_name = file_path.stem  # e.g., "SecDef" from SecDef.yaml
 
-        # Collect dossier files from both flat and nested structures
-        dossier_files = []
+        # Chunk dossiers by semantic sections for better retrieval precision
+        person_name = dossier.get('person', 'Unknown')
+        role_name = dossier.get('role', 'Unknown')
+        header_prefix = f"Person: {person_name} ({role_name})"
 
-        # Flat structure: *.yaml files directly in dossier_dir
-        dossier_files.extend(dossier_dir.glob("*.yaml"))
+        # Serialize nested sections once, and only when present
+        weights_data = dossier.get('interests_weights', {})
+        if weights_data:
+            weights_text = yaml.dump(weights_data, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
+        else:
+            weights_text = 'None specified'
 
-        # Nested structure: role_dir/profile.yaml
-        for role_dir in dossier_dir.iterdir():
-            if role_dir.is_dir():
-                profile_path = role_dir / "profile.yaml"
-                if profile_path.exists():
-                    dossier_files.append(profile_path)
-
-        for file_path in dossier_files:
-            with open(file_path, 'r') as f:
-                dossier = yaml.safe_load(f)
-
-            # Convert dossier to text representation
-            text_parts = [
-                f"Person: {dossier.get('person', 'Unknown')}",
-                f"Role: {dossier.get('role', 'Unknown')}",
-                f"Mandate: {dossier.get('mandate', '')}",
-                f"\nEnduring Priorities:\n{dossier.get('enduring_priorities', '')}",
-                f"\nPositions:\n{yaml.dump(dossier.get('positions', {}), default_flow_style=False)}",
-                f"\nRecent Actions:\n{dossier.get('recent_actions', '')}",
-                f"\nConstraints:\n{dossier.get('constraints', '')}"
-            ]
-            content = "\n\n".join(text_parts)
-
-            # Determine source name (role)
-            if file_path.name == "profile.yaml":
-                source_name = file_path.parent.name  # e.g., "President" from President/profile.yaml
-            else:
-                source_name = file_path.stem  # e.g., "SecDef" from SecDef.yaml
-
-            # Chunk dossiers by semantic sections for better retrieval precision
-            person_name = dossier.get('person', 'Unknown')
-            role_name = dossier.get('role', 'Unknown')
-
-            chunks = []
+        positions_data = dossier.get('positions', {})
+        positions_chunk = None
+        if positions_data:
+            positions_text = yaml.dump(positions_data, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
+            positions_chunk = f"""{header_prefix}
+
+Known Positions:
+{positions_text}""".strip()
 
+        sections = (
             # Chunk 1: Identity & Mandate
-            identity_chunk = f"""Person: {person_name}
+            ("identity", f"""Person: {person_name}
 Role: {role_name}
 
-Mandate: {dossier.get('mandate', '')}""".strip()
-            chunks.append(("identity", identity_chunk))
-
+Mandate: {dossier.get('mandate', '')}""".strip()),
             # Chunk 2: Priorities & Weights
-            priorities_data = dossier.get('enduring_priorities', '')
-            weights_data = dossier.get('interests_weights', {})
-            priorities_chunk = f"""Person: {person_name} ({role_name})
+            ("priorities", f"""{header_prefix}
 
 Enduring Priorities:
-{priorities_data}
+{dossier.get('enduring_priorities', '')}
 
 Interest Weights:
-{yaml.dump(weights_data, default_flow_style=False) if weights_data else 'None specified'}""".strip()
-            chunks.append(("priorities", priorities_chunk))
-
+{weights_text}""".strip()),
             # Chunk 3: Positions (only if exists)
-            positions_data = dossier.get('positions', {})
-            if positions_data:
-                positions_chunk = f"""Person: {person_name} ({role_name})
-
-Known Positions:
-{yaml.dump(positions_data, default_flow_style=False)}""".strip()
-                chunks.append(("positions", positions_chunk))
-
+            ("positions", positions_chunk),
             # Chunk 4: Constraints & Red Lines
-            constraints_chunk = f"""Person: {person_name} ({role_name})
+            ("constraints", f"""{header_prefix}
 
 Red Lines: {dossier.get('red_lines', [])}
 
@@ -262,44 +434,107 @@ Constraints: {dossier.get('constraints', '')}
 
 Decision-Making Style: {dossier.get('decision_making_style', '')}
 
-Recent Actions: {dossier.get('recent_actions', '')}""".strip()
-            chunks.append(("constraints", constraints_chunk))
-
-            # Store each chunk with enhanced metadata
-            for section_type, chunk_text in chunks:
-                documents.append(chunk_text)
-                metadatas.append({
-                    "source": source_name,
-                    "person": person_name,
-                    "role": role_name,
-                    "source_type": "dossier",
-                    "section": section_type,
-                    "ingested_at": datetime.now().isoformat()
-                })
-                ids.append(self._generate_doc_id(chunk_text, {"source": source_name, "section": section_type}))
+Recent Actions: {dossier.get('recent_actions', '')}""".strip()),
+        )
+
+        # Store each chunk with enhanced metadata
+        file_metadata = {
+            "source": source_name,
+            "person": person_name,
+            "role": role_name,
+            "source_type": "dossier",
+            "ingested_at": ingested_at
+        }
+        for section_type, chunk_text in sections:
+            if chunk_text is None:
+                continue
+            documents.append(chunk_text)
+            metadatas.append({**file_metadata, "section": section_type})
+            ids.append(self._generate_doc_id(chunk_text, {"source": source_name, "section": section_type}))
+
+        return documents, metadatas, ids
+
+    def ingest_dossiers(self, cache_only: bool = False) -> Tuple[List[str], List[Dict], List[str]]:
+        """
+        Ingest agent dossiers from data/dossiers directory.
+
+        Args:
+            cache_only: Only return cached results, skipping uncached files
+
+        Returns:
+            Tuple of (documents, metadatas, ids)
+        """
+        documents = []
+        metadatas = []
+        ids = []
+        ingested_at = int(time.time())
+
+        dossier_files = self._dossier_files()
+        if dossier_files is None:
+            return documents, metadatas, ids
+
+        # Read and parse dossier files concurrently to overlap file I/O
+        if dossier_files:
+            with ThreadPoolExecutor(max_workers=min(8, len(dossier_files))) as executor:
+                for result in executor.map(
+                    lambda path: self._ingest_file(path, "dossier", ingested_at, cache_only), dossier_files
+                ):
+                    if result is not None:
+                        documents.extend(result[0])
+                        metadatas.extend(result[1])
+                        ids.extend(result[2])
 
         print(f"Ingested {len(documents)} dossier chunks from {len(dossier_files)} agents")
         return documents, metadatas, ids
 
-    def ingest_all(self) -> Dict[str, Tuple[List[str], List[Dict], List[str]]]:
+    def ingest_all(self, cache_only: bool = False) -> Dict[str, Tuple[List[str], List[Dict], List[str]]]:
         """
         Ingest all document types.
 
+        Args:
+            cache_only: Only return cached results, skipping uncached files
+
         Returns:
             Dict mapping collection names to (documents, metadatas, ids) tuples
         """
         results = {}
 
         print("Ingesting memos...")
-        results["memo"] = self.ingest_memos()
+        results["memo"] = self.ingest_memos(cache_only)
 
         print("Ingesting doctrine...")
-        results["doctrine"] = self.ingest_doctrine()
+        results["doctrine"] = self.ingest_doctrine(cache_only)
 
         print("Ingesting dossiers...")
-        results["dossiers"] = self.ingest_dossiers()
+        results["dossiers"] = self.ingest_dossiers(cache_only)
 
         # News ingestion would go here (not implemented yet)
         results["news"] = ([], [], [])
 
-        return results
+        # Trim the cache once per run rather than on every write
+        if self._cache is not None:
+            self._cache.evict(min_keep=len(self._cache_keys))
+            self._cache_keys.clear()
+
+        # Identical chunks would waste embedding calls and collide in Chroma
+        return {name: self._dedupe(*result) for name, result in results.items()}
+
+    def dry_run(self) -> Dict[str, Tuple[List[str], List[Dict], List[str]]]:
+        """
+        Resolve every source file without reading or chunking any of them.
+
+        Exercises the same directory and file discovery as ingest_all(), so
+        a smoke test still fails on broken config or data paths.
+
+        Returns:
+            Dict mapping collection names to empty (documents, metadatas, ids) tuples
+        """
+        for name, list_files in (
+            ("memo", self._memo_files),
+            ("doctrine", self._doctrine_files),
+            ("dossiers", self._dossier_files),
+        ):
+            files = list_files()
+            print(f"{name}: {len(files or [])} source files")
+
+        return {name: ([], [], []) for name in ("memo", "doctrine", "dossiers", "news")}
@@ -0,0 +1,94 @@
+"""
+On-disk cache of per-file ingestion results for GaddisAI RAG system.
+
+Each entry holds the (documents, metadatas, ids) produced from one source
+file, keyed by a SHA-256 of the file's bytes plus the settings that shape
+the chunks, so unchanged files are never re-parsed or re-chunked.
+"""
+
+import os
+import pickle
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Default location and size of the ingest cache
+DEFAULT_CACHE_DIR = ".cache/ingest"
+MAX_ENTRIES = 1000
+
+IngestResult = Tuple[List[str], List[Dict], List[str]]
+
+
+class IngestCache:
+    """LRU-bounded pickle cache of per-file ingestion results."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = MAX_ENTRIES):
+        """
+        Initialize ingest cache.
+
+        Args:
+            cache_dir: Directory holding cached results
+            max_entries: Entries kept by evict() before the least recently used go
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def key(self, file_path: Path, settings: str) -> str:
+        """Key for a file's current content under the given ingestion settings."""
+        h = hashlib.sha256(settings.encode())
+        h.update(b'\0')
+        h.update(file_path.read_bytes())
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[IngestResult]:
+        """Return the cached result for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+            # Mark as recently used for eviction
+            os.utime(path)
+            return result
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, key: str, result: IngestResult):
+        """Store a result atomically (call evict() once done storing)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _path(self, key: str) -> str:
+        """Cache file path for a key."""
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def evict(self, min_keep: int = 0):
+        """
+        Remove least recently used entries beyond the cap.
+
+        Args:
+            min_keep: Raise the cap to this many entries, so the files used
+                by the current run are never evicted
+        """
+        keep = max(self.max_entries, min_keep)
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".pkl"):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:
+                        continue
+
+        if len(entries) <= keep:
+            return
+
+        entries.sort()
+        for _, path in entries[:len(entries) - keep]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -3,9 +3,10 @@ Context retrieval for GaddisAI agents.
 Retrieves relevant documents from vector store based on query.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-import yaml
+
+from utils import yaml_cache
 
 
 class ContextRetriever:
@@ -22,8 +23,18 @@ class ContextRetriever:
         self.vectorstore = vectorstore
 
         # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = yaml_cache.load(config_path)
+
+        # Resolve per-query config lookups once
+        top_k = self.config.get("top_k", {})
+        self._top_k = {doc_type: top_k.get(doc_type, 3) for doc_type in self.vectorstore.collections}
+        self._news_cutoff_delta = timedelta(
+            days=self.config.get("filters", {}).get("news_max_age_days", 7)
+        )
+
+        # Advisor roles only change when dossiers are (re)ingested
+        self._advisor_cache: Optional[Tuple[str, ...]] = None
+        self.vectorstore.add_change_callback(self._on_collection_changed)
 
     def retrieve_for_query(
         self,
@@ -42,45 +53,64 @@ class ContextRetriever:
             Dict mapping collection names to lists of retrieved documents
             Each document is a dict with 'content', 'metadata', 'distance'
         """
+        return self.retrieve_for_queries([query], include_types)[0]
+
+    def retrieve_for_queries(
+        self,
+        queries: List[str],
+        include_types: Optional[List[str]] = None
+    ) -> List[Dict[str, List[Dict]]]:
+        """
+        Retrieve context for several queries with one vector store call per collection.
+
+        Args:
+            queries: User queries or policy questions
+            include_types: Optional list of doc types to retrieve
+                          (defaults to ["memo", "doctrine", "dossiers"])
+
+        Returns:
+            List with one entry per query, each shaped like retrieve_for_query()
+        """
         if include_types is None:
             include_types = ["memo", "doctrine", "dossiers"]
 
-        results = {}
+        results = [{} for _ in queries]
+        if not queries:
+            return results
 
         for doc_type in include_types:
             if doc_type not in self.vectorstore.collections:
                 continue
 
             # Get top_k for this document type
-            n_results = self.config.get("top_k", {}).get(doc_type, 3)
+            n_results = self._top_k[doc_type]
 
             # Build filters if needed
             where_filter = None
             if doc_type == "news":
                 # Filter news by max age
-                max_age_days = self.config.get("filters", {}).get("news_max_age_days", 7)
-                cutoff_date = datetime.now() - timedelta(days=max_age_days)
+                cutoff_date = datetime.now() - self._news_cutoff_delta
                 where_filter = {"published_date": {"$gte": cutoff_date.isoformat()}}
 
             # Query vector store
-            raw_results = self.vectorstore.query(
-                query_text=query,
+            raw_results = self.vectorstore.query_batch(
+                query_texts=queries,
                 collection_name=doc_type,
                 n_results=n_results,
                 where=where_filter
             )
 
-            # Format results
-            formatted_results = []
-            for i in range(len(raw_results["documents"][0])):
-                formatted_results.append({
-                    "content": raw_results["documents"][0][i],
-                    "metadata": raw_results["metadatas"][0][i],
-                    "distance": raw_results["distances"][0][i],
-                    "id": raw_results["ids"][0][i]
-                })
-
-            results[doc_type] = formatted_results
+            # Split parallel result lists back out per query
+            for k, query_results in enumerate(results):
+                query_results[doc_type] = [
+                    {"content": doc, "metadata": metadata, "distance": distance, "id": doc_id}
+                    for doc, metadata, distance, doc_id in zip(
+                        raw_results["documents"][k],
+                        raw_results["metadatas"][k],
+                        raw_results["distances"][k],
+                        raw_results["ids"][k]
+                    )
+                ]
 
         return results
 
@@ -101,11 +131,12 @@ class ContextRetriever:
             n_results=1
         )
 
-        if not raw_results["documents"][0]:
+        docs = raw_results["documents"][0]
+        if not docs:
             return None
 
         return {
-            "content": raw_results["documents"][0][0],
+            "content": docs[0],
             "metadata": raw_results["metadatas"][0][0],
             "distance": raw_results["distances"][0][0],
             "id": raw_results["ids"][0][0]
@@ -156,6 +187,10 @@ class ContextRetriever:
         Returns:
             List of role names (e.g., ["SecDef", "SecState", "NSA"])
         """
+        # Hand out copies so callers can't mutate the cached list
+        if self._advisor_cache is not None:
+            return list(self._advisor_cache)
+
         # Query all dossiers
         all_dossiers = self.vectorstore.collections["dossiers"].get()
 
@@ -165,4 +200,14 @@ class ContextRetriever:
             if source and source not in roles:
                 roles.append(source)
 
-        return sorted(roles)
+        self._advisor_cache = tuple(sorted(roles))
+        return list(self._advisor_cache)
+
+    def invalidate_advisor_cache(self):
+        """Drop the cached advisor list so the next lookup rescans dossiers."""
+        self._advisor_cache = None
+
+    def _on_collection_changed(self, collection_name: str):
+        """VectorStore callback: invalidate caches derived from a collection."""
+        if collection_name == "dossiers":
+            self.invalidate_advisor_cache()
@@ -4,12 +4,138 @@ Uses ChromaDB for document storage and retrieval.
 """
 
 import os
+import hashlib
+import sqlite3
+import weakref
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
+import numpy as np
 import chromadb
+from chromadb.api.types import Documents, Embeddings
 from chromadb.config import Settings
-from chromadb.utils import embedding_functions
-import yaml
+from chromadb.utils.embedding_functions import OpenAIEmbeddingFunction
+
+from utils import yaml_cache
+
+
+# Maximum number of inputs the OpenAI embeddings endpoint accepts per request
+MAX_EMBED_BATCH = 2048
+
+# Metadata value types Chroma stores natively
+_METADATA_TYPES = (str, int, float, bool)
+
+# Keys per SELECT ... IN (...) lookup, kept under SQLite's bound-parameter limit
+_CACHE_LOOKUP_BATCH = 500
+
+
+class BatchedOpenAIEmbeddingFunction(OpenAIEmbeddingFunction):
+    """
+    OpenAI embedding function that sends inputs in as few requests as possible.
+
+    It keeps Chroma's "openai" name and config, so stores created with the
+    stock OpenAIEmbeddingFunction open with it and vice versa.
+
+    Document embeddings are cached on disk keyed by a hash of (model, text),
+    so re-ingesting unchanged documents never hits the API; query strings
+    are never cached. Cached vectors may be stored at reduced precision
+    (float16 by default); OpenAI embeddings are L2-normalized, so cosine
+    distances are approximately preserved.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_path: Optional[str] = None,
+        cache_dtype: str = "float16"
+    ):
+        """
+        Initialize embedding function.
+
+        Args:
+            model_name: Embedding model name
+            cache_path: Optional SQLite file for the embedding cache
+            cache_dtype: NumPy dtype for cached vectors (float16 or float32)
+        """
+        # Reads the key from OPENAI_API_KEY, which is also what gets persisted
+        super().__init__(api_key_env_var="OPENAI_API_KEY", model_name=model_name)
+        self.cache_dtype = np.dtype(cache_dtype)
+
+        self._emb_cache = None
+        if cache_path:
+            self._emb_cache = sqlite3.connect(cache_path, check_same_thread=False)
+            self._emb_cache.execute(
+                "CREATE TABLE IF NOT EXISTS emb(hash BLOB PRIMARY KEY, vec BLOB)"
+            )
+            self._emb_cache.commit()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        texts = list(input)
+        if self._emb_cache is None:
+            return self._embed_batched(texts)
+
+        keys = [self._cache_key(text) for text in texts]
+        vectors = self._cache_lookup(set(keys))
+
+        # Embed each distinct uncached text once
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in misses:
+                misses[key] = text
+
+        if misses:
+            new_vectors = self._embed_batched(list(misses.values())).astype(self.cache_dtype)
+            self._emb_cache.executemany(
+                "INSERT OR IGNORE INTO emb(hash, vec) VALUES (?, ?)",
+                [(key, vec.tobytes()) for key, vec in zip(misses, new_vectors)]
+            )
+            self._emb_cache.commit()
+            vectors.update(zip(misses, new_vectors))
+
+        return np.asarray([vectors[key] for key in keys], dtype=np.float32)
+
+    def embed_query(self, input: Documents) -> Embeddings:
+        """Embed query strings without caching them; only documents are cached."""
+        return self._embed_batched(list(input))
+
+    def _cache_key(self, text: str) -> bytes:
+        """Hash a text together with the model name and storage dtype."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.model_name.encode())
+        h.update(b'\0')
+        h.update(self.cache_dtype.str.encode())
+        h.update(b'\0')
+        h.update(text.encode())
+        return h.digest()
+
+    def _cache_lookup(self, keys: set) -> Dict[bytes, np.ndarray]:
+        """Fetch cached vectors for the given keys."""
+        found = {}
+        keys = list(keys)
+        for start in range(0, len(keys), _CACHE_LOOKUP_BATCH):
+            batch = keys[start:start + _CACHE_LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._emb_cache.execute(
+                f"SELECT hash, vec FROM emb WHERE hash IN ({placeholders})", batch
+            )
+            for key, vec in rows:
+                found[key] = np.frombuffer(vec, dtype=self.cache_dtype)
+
+        return found
+
+    def _embed_batched(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with one API request per MAX_EMBED_BATCH inputs."""
+        embeddings = []
+        for start in range(0, len(texts), MAX_EMBED_BATCH):
+            response = self.client.embeddings.create(
+                input=texts[start:start + MAX_EMBED_BATCH],
+                model=self.model_name
+            )
+            # Results are not guaranteed to come back in input order
+            embeddings.extend(
+                item.embedding for item in sorted(response.data, key=lambda d: d.index)
+            )
+
+        return np.asarray(embeddings, dtype=np.float32)
 
 
 class VectorStore:
@@ -26,8 +152,7 @@ class VectorStore:
         self.persist_directory = persist_directory
 
         # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = yaml_cache.load(config_path)
 
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(
@@ -36,11 +161,15 @@ class VectorStore:
         )
 
         # Initialize embedding function
-        self.embedding_function = embedding_functions.OpenAIEmbeddingFunction(
-            api_key=os.environ.get("OPENAI_API_KEY"),
-            model_name=self.config.get("embed_model", "text-embedding-3-small")
+        self.embedding_function = BatchedOpenAIEmbeddingFunction(
+            model_name=self.config.get("embed_model", "text-embedding-3-small"),
+            cache_path=os.path.join(persist_directory, "emb_cache.db"),
+            cache_dtype=self.config.get("embed_cache_dtype", "float16")
         )
 
+        # Weak references to bound methods notified when a collection changes
+        self._change_callbacks: List[weakref.WeakMethod] = []
+
         # Create/get collections for each document type
         self.collections = {}
         for doc_type in ["memo", "doctrine", "dossiers", "news"]:
@@ -69,15 +198,44 @@ class VectorStore:
         if collection_name not in self.collections:
             raise ValueError(f"Unknown collection: {collection_name}")
 
+        # Chroma only accepts primitive metadata values; stringify anything else
+        metadatas = [
+            metadata if all(isinstance(v, _METADATA_TYPES) for v in metadata.values())
+            else {k: v if isinstance(v, _METADATA_TYPES) else str(v) for k, v in metadata.items()}
+            for metadata in metadatas
+        ]
+
         collection = self.collections[collection_name]
-        collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
+        for start in range(0, len(documents), MAX_EMBED_BATCH):
+            end = start + MAX_EMBED_BATCH
+            collection.add(
+                documents=documents[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
+            )
 
+        self._notify_change(collection_name)
         print(f"Added {len(documents)} documents to {collection_name} collection")
 
+    def add_change_callback(self, callback: Callable[[str], None]):
+        """
+        Register a bound method to call with a collection name when it changes.
+
+        Only a weak reference is kept, so registration does not keep the
+        callback's owner alive.
+        """
+        self._change_callbacks.append(weakref.WeakMethod(callback))
+
+    def _notify_change(self, collection_name: str):
+        """Invoke live change callbacks and drop dead ones."""
+        live = []
+        for ref in self._change_callbacks:
+            callback = ref()
+            if callback is not None:
+                callback(collection_name)
+                live.append(ref)
+        self._change_callbacks = live
+
     def query(
         self,
         query_text: str,
@@ -97,6 +255,33 @@ class VectorStore:
         Returns:
             Dict with 'documents', 'metadatas', 'distances', 'ids'
         """
+        return self.query_batch(
+            query_texts=[query_text],
+            collection_name=collection_name,
+            n_results=n_results,
+            where=where
+        )
+
+    def query_batch(
+        self,
+        query_texts: List[str],
+        collection_name: str,
+        n_results: Optional[int] = None,
+        where: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Query a specific collection with several query strings in one call.
+
+        Args:
+            query_texts: Query strings
+            collection_name: Name of collection to query
+            n_results: Number of results per query (defaults to config top_k)
+            where: Optional metadata filter
+
+        Returns:
+            Dict with 'documents', 'metadatas', 'distances', 'ids', each a
+            list with one entry per query
+        """
         if collection_name not in self.collections:
             raise ValueError(f"Unknown collection: {collection_name}")
 
@@ -105,7 +290,7 @@ class VectorStore:
 
         collection = self.collections[collection_name]
         results = collection.query(
-            query_texts=[query_text],
+            query_texts=query_texts,
             n_results=n_results,
             where=where
         )
@@ -123,6 +308,7 @@ class VectorStore:
             embedding_function=self.embedding_function,
             metadata={"hnsw:space": "cosine"}
         )
+        self._notify_change(collection_name)
         print(f"Cleared collection: {collection_name}")
 
     def get_collection_count(self, collection_name: str) -> int:
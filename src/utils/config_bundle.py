@@ -0,0 +1,123 @@
+"""
+Pre-parsed bundle of config and dossier YAML files.
+
+`python src/compile_configs.py` parses config/*.yaml and every dossier once
+and pickles the results into a single bundle. Agents read their dossier
+and roles config from the bundle, falling back to YAML whenever the bundle
+is missing, doesn't cover a file, or any of its source files has changed
+since it was built.
+"""
+
+import os
+import copy
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Default bundle location
+BUNDLE_PATH = "./config/_compiled.pkl"
+
+# Loaded bundles by path, with the bundle's mtime when loaded
+_bundles: Dict[str, tuple] = {}
+
+
+def _dossier_files(dossier_dir: Path) -> Dict[str, Path]:
+    """Map role names to dossier files, for flat and nested (role/profile.yaml) layouts."""
+    files = {path.stem: path for path in dossier_dir.glob("*.yaml")}
+    files.update({path.parent.name: path for path in dossier_dir.glob("**/profile.yaml")})
+    return files
+
+
+def compile_bundle(
+    config_dir: str = "./config",
+    dossier_dir: str = "./data/dossiers",
+    bundle_path: str = BUNDLE_PATH
+) -> Dict[str, Any]:
+    """
+    Parse all config and dossier YAML files and write them to one pickle.
+
+    Args:
+        config_dir: Directory of config YAML files
+        dossier_dir: Directory of dossier YAML files
+        bundle_path: Output pickle path
+
+    Returns:
+        The bundle that was written
+    """
+    bundle = {"sources": {}, "configs": {}, "dossiers": {}}
+
+    def _parse(path: Path):
+        source = os.path.abspath(path)
+        bundle["sources"][source] = os.path.getmtime(source)
+        with open(source, 'rb') as f:
+            return source, yaml.load(f, Loader=SafeLoader)
+
+    for path in sorted(Path(config_dir).glob("*.yaml")):
+        bundle["configs"][path.stem] = _parse(path)
+
+    for role, path in sorted(_dossier_files(Path(dossier_dir)).items()):
+        bundle["dossiers"][role] = _parse(path)
+
+    tmp_path = f"{bundle_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, bundle_path)
+
+    return bundle
+
+
+def _load_bundle(bundle_path: str) -> Optional[Dict[str, Any]]:
+    """Return the bundle if it exists and is newer than all of its sources."""
+    try:
+        bundle_mtime = os.path.getmtime(bundle_path)
+    except OSError:
+        return None
+
+    cached = _bundles.get(bundle_path)
+    if cached is None or cached[0] != bundle_mtime:
+        try:
+            with open(bundle_path, 'rb') as f:
+                cached = (bundle_mtime, pickle.load(f))
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        _bundles[bundle_path] = cached
+
+    bundle = cached[1]
+    for source, mtime in bundle["sources"].items():
+        try:
+            if os.path.getmtime(source) != mtime:
+                return None
+        except OSError:
+            return None
+
+    return bundle
+
+
+def _lookup(section: str, name: str, path: str, bundle_path: str) -> Optional[Any]:
+    """Bundled data for name if it was compiled from path, else None."""
+    bundle = _load_bundle(bundle_path)
+    if bundle is None:
+        return None
+
+    entry = bundle[section].get(name)
+    if entry is None or entry[0] != os.path.abspath(path):
+        return None
+
+    return copy.deepcopy(entry[1])
+
+
+def get_dossier(role: str, dossier_path: str, bundle_path: str = BUNDLE_PATH) -> Optional[Dict]:
+    """Bundled dossier for role, or None if it must be loaded from YAML."""
+    return _lookup("dossiers", role, dossier_path, bundle_path)
+
+
+def get_config(config_path: str, bundle_path: str = BUNDLE_PATH) -> Optional[Dict]:
+    """Bundled config file, or None if it must be loaded from YAML."""
+    return _lookup("configs", Path(config_path).stem, config_path, bundle_path)
@@ -3,6 +3,8 @@ Simple cost tracking utility for OpenAI API usage.
 Provides cost estimates and actual usage tracking.
 """
 
+from functools import lru_cache
+
 
 class CostTracker:
     """Track and estimate OpenAI API costs."""
@@ -27,17 +29,29 @@ class CostTracker:
         }
     }
 
-    def __init__(self, model: str = "gpt-4o-mini"):
+    # OpenAI Batch API requests are billed at half the synchronous price
+    BATCH_DISCOUNT = 0.5
+
+    def __init__(self, model: str = "gpt-4o-mini", use_batch: bool = False):
         """
         Initialize cost tracker.
 
         Args:
             model: OpenAI model name
+            use_batch: Whether requests go through the OpenAI Batch API
         """
         self.model = model
+        self.use_batch = use_batch
         self.total_input_tokens = 0
         self.total_output_tokens = 0
 
+        # Per-token rates, resolved once (batch discount included)
+        pricing = self.PRICING.get(model, self.PRICING["gpt-4o-mini"])
+        multiplier = self.BATCH_DISCOUNT if use_batch else 1.0
+        self._input_rate = pricing["input"] / 1_000_000 * multiplier
+        self._output_rate = pricing["output"] / 1_000_000 * multiplier
+        self._running_cost = 0.0
+
     def estimate_deliberation_cost(self, num_advisors: int = 3, with_memory: bool = True) -> float:
         """
         Estimate cost for a single deliberation.
@@ -49,9 +63,12 @@ class CostTracker:
         Returns:
             Estimated cost in dollars
         """
-        # Get pricing for model
-        pricing = self.PRICING.get(self.model, self.PRICING["gpt-4o-mini"])
+        return self._estimate(self._input_rate, self._output_rate, num_advisors, with_memory)
 
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _estimate(input_rate: float, output_rate: float, num_advisors: int, with_memory: bool) -> float:
+        """Estimated deliberation cost for the given per-token rates (memoized)."""
         # Estimate tokens per component
         advisor_input = 2500  # Dossier + context + query
         advisor_output = 500  # Recommendation with rationale
@@ -69,10 +86,7 @@ class CostTracker:
             # Note: Not adding importance scoring since use_llm is now false by default
 
         # Calculate cost
-        input_cost = (base_input_tokens / 1_000_000) * pricing["input"]
-        output_cost = (base_output_tokens / 1_000_000) * pricing["output"]
-
-        return input_cost + output_cost
+        return base_input_tokens * input_rate + base_output_tokens * output_rate
 
     def add_usage(self, input_tokens: int, output_tokens: int):
         """
@@ -84,6 +98,7 @@ class CostTracker:
         """
         self.total_input_tokens += input_tokens
         self.total_output_tokens += output_tokens
+        self._running_cost += input_tokens * self._input_rate + output_tokens * self._output_rate
 
     def get_total_cost(self) -> float:
         """
@@ -92,12 +107,7 @@ class CostTracker:
         Returns:
             Total cost in dollars
         """
-        pricing = self.PRICING.get(self.model, self.PRICING["gpt-4o-mini"])
-
-        input_cost = (self.total_input_tokens / 1_000_000) * pricing["input"]
-        output_cost = (self.total_output_tokens / 1_000_000) * pricing["output"]
-
-        return input_cost + output_cost
+        return self._running_cost
 
     def format_summary(self) -> str:
         """
@@ -123,6 +133,7 @@ class CostTracker:
         return "\n".join(summary)
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def format_estimate(cost: float, model: str, num_advisors: int, with_memory: bool) -> str:
         """
         Format a cost estimate message.
@@ -0,0 +1,120 @@
+"""
+Process-wide cache for parsed YAML files.
+
+Config and dossier files are loaded by several constructors (VectorStore,
+DocumentIngester, ContextRetriever, the agents). Parsed results are cached
+keyed by path and revalidated against the file's mtime and size, so each
+file is only re-parsed after it changes.
+
+Across processes, each parsed file is mirrored to a JSON sidecar under
+``.cache/yaml``, stamped with the file's mtime and size, that is read
+instead of the YAML while the stamp still matches, since JSON parses far
+faster than YAML.
+"""
+
+import os
+import copy
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Maximum number of parsed files kept in memory
+MAX_ENTRIES = 100
+
+# Directory for JSON sidecars, kept out of the config and data trees
+SIDECAR_DIR = ".cache/yaml"
+
+_cache: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def load(path) -> Any:
+    """
+    Parse a YAML file, reusing the cached result while the file is unchanged.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        A deep copy of the parsed data, safe for the caller to mutate
+    """
+    path = os.fspath(path)
+    stat = os.stat(path)
+
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            _cache.move_to_end(path)
+            return copy.deepcopy(entry[2])
+
+    data = _load_uncached(path, stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        _cache[path] = (stat.st_mtime_ns, stat.st_size, data)
+        _cache.move_to_end(path)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+    return copy.deepcopy(data)
+
+
+def _load_uncached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a file from its JSON sidecar if it matches the file, otherwise from YAML."""
+    sidecar = _sidecar_path(path)
+    try:
+        with open(sidecar, 'rb') as f:
+            stamped = json.load(f)
+        if stamped["mtime_ns"] == mtime_ns and stamped["size"] == size:
+            return stamped["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    with open(path, 'rb') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+
+    _write_sidecar(sidecar, data, mtime_ns, size)
+    return data
+
+
+def _sidecar_path(path: str) -> str:
+    """Sidecar file for a YAML file, named by a hash of its absolute path."""
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(SIDECAR_DIR, f"{digest}.json")
+
+
+def _write_sidecar(sidecar: str, data: Any, mtime_ns: int, size: int):
+    """Write the JSON sidecar atomically, skipping data JSON can't round-trip."""
+    try:
+        text = json.dumps({"mtime_ns": mtime_ns, "size": size, "data": data})
+        if json.loads(text)["data"] != data:
+            # e.g. non-string keys, which JSON would turn into strings
+            return
+    except (TypeError, ValueError):
+        # e.g. dates, which YAML parses into datetime objects
+        return
+
+    # Unique per process and thread, since parallel test workers load the same files
+    tmp_path = f"{sidecar}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        # Read-only location; the in-memory cache still applies
+        pass
+
+
+def clear():
+    """Drop all cached entries."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk and in-memory caches.
+
+Tests:
+1. yaml_cache hits, and re-parses after an mtime or size change
+2. yaml_cache evicts least recently used entries
+3. config_bundle serves fresh bundles and rejects stale or foreign ones
+4. IngestCache hits, misses on changed content or settings, and evicts
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from utils import config_bundle, yaml_cache
+from rag.ingest_cache import IngestCache
+
+
+def _write(path, text, mtime_ns=None):
+    """Write text to path, optionally pinning its mtime."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def _bump_mtime(path):
+    """Move path's mtime one second forward."""
+    mtime_ns = os.stat(path).st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_yaml_cache_invalidation():
+    """Cached YAML is reused until the file's mtime or size changes."""
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(yaml_cache, "SIDECAR_DIR", os.path.join(tmp, "sidecars")):
+        yaml_cache.clear()
+        path = _write(os.path.join(tmp, "a.yaml"), "value: 1\n")
+
+        # Hit: same data, but a copy the caller can mutate
+        first = yaml_cache.load(path)
+        first["value"] = 99
+        assert yaml_cache.load(path) == {"value": 1}
+
+        # Same size, new mtime
+        _write(path, "value: 2\n")
+        _bump_mtime(path)
+        assert yaml_cache.load(path) == {"value": 2}
+
+        # New size, same mtime; also bypasses the sidecar from the last parse
+        mtime_ns = os.stat(path).st_mtime_ns
+        _write(path, "value: 333\n", mtime_ns=mtime_ns)
+        assert yaml_cache.load(path) == {"value": 333}
+
+        # A fresh process (empty memory cache) reads the matching sidecar
+        yaml_cache.clear()
+        with mock.patch.object(yaml_cache.yaml, "load", side_effect=AssertionError("re-parsed")):
+            assert yaml_cache.load(path) == {"value": 333}
+
+        yaml_cache.clear()
+
+
+def test_yaml_cache_eviction():
+    """Only the MAX_ENTRIES most recently used files stay in memory."""
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(yaml_cache, "SIDECAR_DIR", os.path.join(tmp, "sidecars")), \
+            mock.patch.object(yaml_cache, "MAX_ENTRIES", 2):
+        yaml_cache.clear()
+        paths = [_write(os.path.join(tmp, f"{i}.yaml"), f"n: {i}\n") for i in range(3)]
+
+        yaml_cache.load(paths[0])
+        yaml_cache.load(paths[1])
+        yaml_cache.load(paths[0])  # now more recent than paths[1]
+        yaml_cache.load(paths[2])
+
+        assert list(yaml_cache._cache) == [paths[0], paths[2]]
+
+        yaml_cache.clear()
+
+
+def test_config_bundle():
+    """Bundled data is served only for unchanged files at the compiled paths."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = os.path.join(tmp, "config")
+        dossier_dir = os.path.join(tmp, "dossiers")
+        bundle_path = os.path.join(tmp, "_compiled.pkl")
+
+        roles = _write(os.path.join(config_dir, "roles.yaml"), "roles: [SecDef]\n")
+        dossier = _write(os.path.join(dossier_dir, "SecDef", "profile.yaml"), "person: A\n")
+        foreign = _write(os.path.join(tmp, "other", "roles.yaml"), "roles: []\n")
+
+        # No bundle yet
+        assert config_bundle.get_config(roles, bundle_path=bundle_path) is None
+
+        config_bundle.compile_bundle(config_dir, dossier_dir, bundle_path)
+        assert config_bundle.get_config(roles, bundle_path=bundle_path) == {"roles": ["SecDef"]}
+        assert config_bundle.get_dossier("SecDef", dossier, bundle_path=bundle_path) == {"person": "A"}
+
+        # Same name, different file
+        assert config_bundle.get_config(foreign, bundle_path=bundle_path) is None
+        assert config_bundle.get_dossier("NSA", dossier, bundle_path=bundle_path) is None
+
+        # Any changed source makes the whole bundle stale
+        _bump_mtime(dossier)
+        assert config_bundle.get_config(roles, bundle_path=bundle_path) is None
+        assert config_bundle.get_dossier("SecDef", dossier, bundle_path=bundle_path) is None
+
+        # Recompiling picks the change up
+        config_bundle.compile_bundle(config_dir, dossier_dir, bundle_path)
+        assert config_bundle.get_config(roles, bundle_path=bundle_path) == {"roles": ["SecDef"]}
+
+
+def test_ingest_cache():
+    """Entries are keyed by content and settings, and the oldest are evicted."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = IngestCache(os.path.join(tmp, "cache"), max_entries=2)
+        source = Path(_write(os.path.join(tmp, "memo.txt"), "memo text"))
+        result = (["memo text"], [{"source": "memo.txt"}], ["id-0"])
+
+        key = cache.key(source, "settings")
+        assert cache.get(key) is None
+        cache.put(key, result)
+        assert cache.get(key) == result
+
+        # Changed settings or content give new keys
+        assert cache.key(source, "other settings") != key
+        source.write_text("edited memo text", encoding="utf-8")
+        assert cache.key(source, "settings") != key
+
+        # Evict the least recently used beyond the cap, unless asked to keep more
+        keys = []
+        for i in range(4):
+            keys.append(f"k{i}")
+            cache.put(keys[-1], result)
+            os.utime(cache._path(keys[-1]), ns=(i * 10**9, i * 10**9))
+        os.utime(cache._path(key), ns=(0, 0))
+
+        cache.evict(min_keep=5)
+        assert len(os.listdir(cache.cache_dir)) == 5
+
+        cache.evict()
+        assert sorted(os.listdir(cache.cache_dir)) == ["k2.pkl", "k3.pkl"]
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_yaml_cache_invalidation,
+        test_yaml_cache_eviction,
+        test_config_bundle,
+        test_ingest_cache,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\nTotal: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,101 +9,131 @@ Tests:
 4. Basic content validation (non-empty, reasonable length)
 """
 
+import io
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+BASE_DIR = Path("data")
+
+# Expected structure
+EXPECTED_FILES = {
+    "memo": ["regional_strategy.txt"],
+    "doctrine": ["national_defense_strategy.txt", "treaty_commitments.txt"],
+    "dossiers": ["President.yaml", "NSA.yaml", "SecDef.yaml", "SecState.yaml"],
+    "news": ["regional_developments.txt", "defense_updates.txt", "diplomatic_developments.txt"]
+}
+
+# Flattened (dir_name, file_name, path) entries, built once
+_EXPECTED = tuple(
+    (dir_name, file_name, BASE_DIR / dir_name / file_name)
+    for dir_name, file_list in EXPECTED_FILES.items()
+    for file_name in file_list
+)
+
+
+def _check_one(spec):
+    """
+    Read and validate one expected file.
+
+    Returns:
+        Tuple of (dir_name, message, results key, results entry)
+    """
+    dir_name, file_name, file_path = spec
+
+    # stat first so missing and empty files never get opened
+    try:
+        size = file_path.stat().st_size
+    except FileNotFoundError:
+        return dir_name, f"  ❌ Missing: {file_name}", "missing", str(file_path)
+
+    if size == 0:
+        return dir_name, f"  ⚠️  Empty: {file_name}", "errors", f"{file_path} is empty"
+
+    try:
+        # Try to read the file
+        content = file_path.read_text(encoding='utf-8')
+    except Exception as e:
+        return dir_name, f"  ❌ Error reading {file_name}: {e}", "errors", f"{file_path}: {e}"
+
+    # Validate content
+    if len(content) < 100:
+        return (dir_name, f"  ⚠️  Too short: {file_name} ({len(content)} chars)",
+                "errors", f"{file_path} suspiciously short")
+
+    word_count = len(content.split())
+    return (dir_name, f"  ✅ {file_name} ({word_count} words, {len(content)} chars)",
+            "success", (str(file_path), word_count))
+
 
 def test_data_loading():
     """Test that all data files load correctly."""
 
-    base_dir = Path("data")
     results = {"success": [], "missing": [], "errors": []}
 
-    # Define expected structure
-    expected_files = {
-        "memo": ["regional_strategy.txt"],
-        "doctrine": ["national_defense_strategy.txt", "treaty_commitments.txt"],
-        "dossiers": ["President.yaml", "NSA.yaml", "SecDef.yaml", "SecState.yaml"],
-        "news": ["regional_developments.txt", "defense_updates.txt", "diplomatic_developments.txt"]
-    }
+    # Collect the report and write it in one go at the end
+    buf = io.StringIO()
+
+    print("=" * 60, file=buf)
+    print("DATA LOADING TEST", file=buf)
+    print("=" * 60, file=buf)
 
-    print("=" * 60)
-    print("DATA LOADING TEST")
-    print("=" * 60)
+    # Read and validate files concurrently; output is printed in order below
+    present_dirs = {dir_name for dir_name in EXPECTED_FILES if (BASE_DIR / dir_name).exists()}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        records = list(executor.map(
+            _check_one, [entry for entry in _EXPECTED if entry[0] in present_dirs]
+        ))
 
-    # Check each directory and file
-    for dir_name, file_list in expected_files.items():
-        dir_path = base_dir / dir_name
+    # Report each directory and file
+    for dir_name in EXPECTED_FILES:
+        dir_path = BASE_DIR / dir_name
 
-        print(f"\n📁 {dir_name}/")
+        print(f"\n📁 {dir_name}/", file=buf)
 
-        if not dir_path.exists():
-            print(f"  ❌ Directory not found: {dir_path}")
+        if dir_name not in present_dirs:
+            print(f"  ❌ Directory not found: {dir_path}", file=buf)
             results["missing"].append(str(dir_path))
             continue
 
-        for file_name in file_list:
-            file_path = dir_path / file_name
-
-            if not file_path.exists():
-                print(f"  ❌ Missing: {file_name}")
-                results["missing"].append(str(file_path))
-                continue
-
-            try:
-                # Try to read the file
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Validate content
-                if len(content) == 0:
-                    print(f"  ⚠️  Empty: {file_name}")
-                    results["errors"].append(f"{file_path} is empty")
-                elif len(content) < 100:
-                    print(f"  ⚠️  Too short: {file_name} ({len(content)} chars)")
-                    results["errors"].append(f"{file_path} suspiciously short")
-                else:
-                    word_count = len(content.split())
-                    print(f"  ✅ {file_name} ({word_count} words, {len(content)} chars)")
-                    results["success"].append(str(file_path))
-
-            except Exception as e:
-                print(f"  ❌ Error reading {file_name}: {e}")
-                results["errors"].append(f"{file_path}: {e}")
+        for record_dir, message, result_key, result_value in records:
+            if record_dir == dir_name:
+                print(message, file=buf)
+                results[result_key].append(result_value)
 
     # Summary
-    print("\n" + "=" * 60)
-    print("SUMMARY")
-    print("=" * 60)
-    print(f"✅ Successfully loaded: {len(results['success'])} files")
-    print(f"❌ Missing: {len(results['missing'])} files")
-    print(f"⚠️  Errors: {len(results['errors'])} files")
+    print("\n" + "=" * 60, file=buf)
+    print("SUMMARY", file=buf)
+    print("=" * 60, file=buf)
+    print(f"✅ Successfully loaded: {len(results['success'])} files", file=buf)
+    print(f"❌ Missing: {len(results['missing'])} files", file=buf)
+    print(f"⚠️  Errors: {len(results['errors'])} files", file=buf)
 
     if results["missing"]:
-        print("\nMissing files:")
+        print("\nMissing files:", file=buf)
         for item in results["missing"]:
-            print(f"  - {item}")
+            print(f"  - {item}", file=buf)
 
     if results["errors"]:
-        print("\nErrors:")
+        print("\nErrors:", file=buf)
         for item in results["errors"]:
-            print(f"  - {item}")
+            print(f"  - {item}", file=buf)
 
     # Total word count
-    total_words = 0
-    for file_path_str in results["success"]:
-        with open(file_path_str, 'r', encoding='utf-8') as f:
-            total_words += len(f.read().split())
+    total_words = sum(word_count for _, word_count in results["success"])
 
-    print(f"\n📊 Total corpus: ~{total_words} words across {len(results['success'])} documents")
+    print(f"\n📊 Total corpus: ~{total_words} words across {len(results['success'])} documents", file=buf)
 
     # Return status
-    if len(results["missing"]) > 0 or len(results["errors"]) > 0:
-        print("\n❌ TEST FAILED - Some files missing or have errors")
-        return False
+    passed = not results["missing"] and not results["errors"]
+    if passed:
+        print("\n✅ TEST PASSED - All data files loaded successfully", file=buf)
     else:
-        print("\n✅ TEST PASSED - All data files loaded successfully")
-        return True
+        print("\n❌ TEST FAILED - Some files missing or have errors", file=buf)
+
+    sys.stdout.write(buf.getvalue())
+    return passed
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for RAG components that don't need the OpenAI API.
+
+Tests:
+1. VectorStore opens Chroma stores created with the stock OpenAI embedding function
+2. Token chunking covers the whole text with overlapping chunks, with and
+   without a tokenizer
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+RETRIEVAL_CFG = "./config/retrieval.yaml"
+COLLECTIONS = ("memo", "doctrine", "dossiers", "news")
+
+# VectorStore needs a key to build its client, but never calls the API here
+_API_ENV = {"OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "sk-test"}
+
+
+def test_vectorstore_opens_existing_store():
+    """A store persisted with chromadb's OpenAIEmbeddingFunction reopens cleanly."""
+    import chromadb
+    from chromadb.config import Settings
+    from chromadb.utils import embedding_functions
+    from rag.vectorstore import VectorStore
+
+    with mock.patch.dict(os.environ, _API_ENV), tempfile.TemporaryDirectory() as persist_dir:
+        # Create the store the way VectorStore did before embeddings were batched
+        client = chromadb.PersistentClient(
+            path=persist_dir,
+            settings=Settings(anonymized_telemetry=False)
+        )
+        embedding_function = embedding_functions.OpenAIEmbeddingFunction(
+            api_key=_API_ENV["OPENAI_API_KEY"],
+            model_name="text-embedding-3-small"
+        )
+        for name in COLLECTIONS:
+            client.get_or_create_collection(
+                name=name,
+                embedding_function=embedding_function,
+                metadata={"hnsw:space": "cosine"}
+            )
+        del client
+
+        store = VectorStore(config_path=RETRIEVAL_CFG, persist_directory=persist_dir)
+        assert set(store.collections) == set(COLLECTIONS)
+        assert store.embedding_function.name() == "openai"
+
+        # And a store it created opens again
+        store = VectorStore(config_path=RETRIEVAL_CFG, persist_directory=persist_dir)
+        assert store.list_collections() == {name: 0 for name in COLLECTIONS}
+
+
+def _ingester(encoding=True):
+    """DocumentIngester without an ingest cache, optionally forced onto the 4-chars-per-token fallback."""
+    from rag.ingest import DocumentIngester
+
+    ingester = DocumentIngester(config_path=RETRIEVAL_CFG, cache_dir=None)
+    if not encoding:
+        ingester._encoding = None
+    return ingester
+
+
+def _assert_covering_chunks(text, chunks):
+    """Assert chunks are in-order slices of text that overlap and leave no text out."""
+    assert chunks, "no chunks"
+
+    spans = []
+    search_from = 0
+    for chunk in chunks:
+        start = text.find(chunk, search_from)
+        assert start >= 0, f"chunk is not a slice of the text: {chunk[:40]!r}"
+        spans.append((start, start + len(chunk)))
+        search_from = start + 1
+
+    assert not text[:spans[0][0]].strip(), "text before the first chunk"
+    assert not text[spans[-1][1]:].strip(), "text after the last chunk"
+    for (_, prev_end), (next_start, _) in zip(spans, spans[1:]):
+        assert next_start < prev_end, "consecutive chunks don't overlap"
+
+
+# Sentences with unique numbers, so every chunk occurs exactly once in the text
+_SAMPLE_TEXT = " ".join(f"Sentence {i} concerns topic {i * 7 % 13}." for i in range(300))
+
+
+def test_chunk_text_covers_text():
+    """Chunks overlap and together cover the text with the configured tokenizer."""
+    ingester = _ingester()
+    _assert_covering_chunks(_SAMPLE_TEXT, ingester._chunk_text(_SAMPLE_TEXT, chunk_size=50, overlap=10))
+
+
+def test_chunk_text_fallback():
+    """Without a tokenizer, chunks are sized at about 4 characters per token."""
+    ingester = _ingester(encoding=False)
+    chunks = ingester._chunk_text(_SAMPLE_TEXT, chunk_size=50, overlap=10)
+
+    _assert_covering_chunks(_SAMPLE_TEXT, chunks)
+    assert all(len(chunk) <= 50 * 4 for chunk in chunks)
+
+
+def test_chunk_text_whitespace():
+    """Empty and whitespace-only text produce no chunks."""
+    for encoding in (True, False):
+        ingester = _ingester(encoding)
+        assert ingester._chunk_text("") == []
+        assert ingester._chunk_text(" \n\t  \n") == []
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_vectorstore_opens_existing_store,
+        test_chunk_text_covers_text,
+        test_chunk_text_fallback,
+        test_chunk_text_whitespace,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\nTotal: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Tests for the dossier researcher that don't need the OpenAI API.
+
+Tests:
+1. Batch API results map back to their requests, with None for failures
+2. Cached dossiers are reused until they expire, the prompt version
+   changes, or a refresh is requested
+3. Fenced and bare JSON replies parse the same
+4. CostTracker keeps a running cost and applies the batch discount
+5. Each event loop gets its own async client
+6. TokenBucket paces spending to its per-minute budget
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+import researcher as researcher_module
+from researcher import DossierResearcher, TokenBucket
+from utils.cost_tracker import CostTracker
+
+
+def _researcher(client=None, cache_dir=None, **kwargs):
+    """Researcher with an optional fake client attached; template mode without one."""
+    researcher = DossierResearcher(use_api=False, cache_dir=cache_dir, **kwargs)
+    if client is not None:
+        researcher.client = client
+        researcher.use_api = True
+    return researcher
+
+
+def _completion_client(dossier):
+    """Fake client whose chat completions always return dossier; counts calls."""
+    calls = []
+
+    def create(**request):
+        calls.append(request)
+        return SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=50),
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(dossier)))],
+        )
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client, calls
+
+
+def _batch_client(batch, output_lines=None):
+    """Fake client whose batch and file endpoints serve one batch."""
+    files_read = []
+
+    def content(file_id):
+        files_read.append(file_id)
+        return SimpleNamespace(text="\n".join(json.dumps(line) for line in output_lines))
+
+    client = SimpleNamespace(
+        batches=SimpleNamespace(retrieve=lambda batch_id: batch),
+        files=SimpleNamespace(content=content),
+    )
+    return client, files_read
+
+
+def _batch(status="completed", output_file_id="file-out", total=0):
+    """Fake batch object."""
+    return SimpleNamespace(
+        status=status,
+        output_file_id=output_file_id,
+        request_counts=SimpleNamespace(total=total),
+    )
+
+
+def test_collect_batch():
+    """Results follow custom_id order; failed or missing requests are None."""
+    dossier = {"person": "A", "role": "SecDef"}
+    output_lines = [
+        # Out of order, and fenced like some model replies
+        {"custom_id": "dossier-1", "response": {"status_code": 200, "body": {
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 200},
+            "choices": [{"message": {"content": "```json\n" + json.dumps(dossier) + "\n```"}}],
+        }}},
+        {"custom_id": "dossier-0", "response": {"status_code": 500, "body": {}}},
+        {"custom_id": "dossier-2", "error": {"message": "failed"}, "response": None},
+    ]
+    client, files_read = _batch_client(_batch(total=4), output_lines)
+    tracker = CostTracker(use_batch=True)
+
+    results = _researcher(client, cost_tracker=tracker).collect_batch("batch-1")
+
+    assert results == [None, dossier, None, None]
+    assert files_read == ["file-out"]
+    # Only the successful request's usage is credited
+    assert (tracker.total_input_tokens, tracker.total_output_tokens) == (1000, 200)
+
+
+def test_collect_batch_all_failed():
+    """A completed batch without an output file yields None for every request."""
+    client, files_read = _batch_client(_batch(output_file_id=None, total=3))
+
+    assert _researcher(client).collect_batch("batch-1") == [None, None, None]
+    assert files_read == []
+
+
+def test_collect_batch_not_completed():
+    """Collecting an unfinished batch raises instead of returning partial results."""
+    client, _ = _batch_client(_batch(status="in_progress"))
+
+    try:
+        _researcher(client).collect_batch("batch-1")
+    except RuntimeError:
+        return
+    raise AssertionError("collect_batch accepted an unfinished batch")
+
+
+def test_dossier_cache():
+    """Dossiers are cached per model, role, person and prompt version, with a TTL."""
+    dossier = {"person": "A", "role": "SecDef"}
+    client, calls = _completion_client(dossier)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        researcher = _researcher(client, cache_dir=cache_dir, cache_ttl=3600)
+
+        assert researcher.research_role("SecDef", "A") == dossier
+        assert researcher.research_role("SecDef", "A") == dossier
+        assert len(calls) == 1
+
+        # Another person is another entry
+        researcher.research_role("SecDef", "B")
+        assert len(calls) == 2
+
+        # refresh skips the cached entry but rewrites it
+        researcher.research_role("SecDef", "A", refresh=True)
+        assert len(calls) == 3
+        researcher.research_role("SecDef", "A")
+        assert len(calls) == 3
+
+        # Expired entries are regenerated
+        cache_path = researcher._cache_path("SecDef", "A")
+        expired = time.time() - 7200
+        os.utime(cache_path, (expired, expired))
+        researcher.research_role("SecDef", "A")
+        assert len(calls) == 4
+
+        # A new prompt version doesn't see dossiers from the old one
+        with mock.patch.object(researcher_module, "PROMPT_VERSION", researcher_module.PROMPT_VERSION + 1):
+            researcher.research_role("SecDef", "A")
+        assert len(calls) == 5
+
+        # Template fallbacks are never cached
+        template_researcher = _researcher(cache_dir=cache_dir)
+        template_researcher.research_role("NSA")
+        assert not os.path.exists(template_researcher._cache_path("NSA", None))
+
+
+def test_parse_dossier_fences():
+    """Replies wrapped in ```json, ```yaml or bare ``` fences parse like bare JSON."""
+    dossier = {"person": "A", "positions": [{"claim": "x"}]}
+    text = json.dumps(dossier, indent=2)
+    researcher = _researcher()
+
+    for content in (text, f"```json\n{text}\n```", f"```yaml\n{text}\n```", f"  ```\n{text}\n```  "):
+        assert researcher._parse_dossier(content) == dossier
+
+
+def test_cost_tracker():
+    """The running cost matches the per-token prices, halved for batch requests."""
+    tracker = CostTracker(model="gpt-4o-mini")
+    tracker.add_usage(1_000_000, 0)
+    tracker.add_usage(0, 500_000)
+    assert abs(tracker.get_total_cost() - (0.150 + 0.300)) < 1e-9
+    assert (tracker.total_input_tokens, tracker.total_output_tokens) == (1_000_000, 500_000)
+
+    batch_tracker = CostTracker(model="gpt-4o-mini", use_batch=True)
+    batch_tracker.add_usage(1_000_000, 500_000)
+    assert abs(batch_tracker.get_total_cost() - tracker.get_total_cost() * CostTracker.BATCH_DISCOUNT) < 1e-9
+
+    # Estimates use the discounted rates too
+    assert batch_tracker.estimate_deliberation_cost() < tracker.estimate_deliberation_cost()
+
+
+def test_async_client_per_loop():
+    """The async client is shared within an event loop but never across loops."""
+    async def clients():
+        return researcher_module._get_async_client(), researcher_module._get_async_client()
+
+    with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test"}):
+        first, again = asyncio.run(clients())
+        second, _ = asyncio.run(clients())
+
+    assert first is again
+    assert first is not second
+
+
+def test_token_bucket_pacing():
+    """A drained bucket waits for the refill its next request needs."""
+    async def spend():
+        bucket = TokenBucket(tokens_per_minute=6000)  # 100 tokens per second
+        start = time.monotonic()
+        await bucket.acquire(6000)  # the full initial budget, no wait
+        drained = time.monotonic() - start
+        await bucket.acquire(20)  # needs 0.2s of refill
+        return drained, time.monotonic() - start
+
+    drained, total = asyncio.run(spend())
+    assert drained < 0.05
+    assert 0.18 <= total < 1.0
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_collect_batch,
+        test_collect_batch_all_failed,
+        test_collect_batch_not_completed,
+        test_dossier_cache,
+        test_parse_dossier_fences,
+        test_cost_tracker,
+        test_async_client_per_loop,
+        test_token_bucket_pacing,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\nTotal: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
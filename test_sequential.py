@@ -5,42 +5,65 @@ Tests structure and method signatures without calling OpenAI API.
 """
 
 import sys
+import inspect
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+# Import the modules under test once; each test reads classes from _MODS
+_MODS = {}
+_IMPORT_ERROR = None
+try:
+    from agents.advisor_agent import AdvisorAgent
+    from agents.president_agent import PresidentAgent
+    from orchestrator import NSCOrchestrator, SequentialMeetingState
+    _MODS.update(
+        AdvisorAgent=AdvisorAgent,
+        PresidentAgent=PresidentAgent,
+        NSCOrchestrator=NSCOrchestrator,
+        SequentialMeetingState=SequentialMeetingState,
+    )
+except Exception as e:
+    _IMPORT_ERROR = e
+
+# Methods each class must expose for the sequential workflow
+ADVISOR_METHODS = ('present_problems', 'answer_question')
+PRESIDENT_METHODS = ('select_problem_and_question', 'synthesize_policy_document')
+ORCHESTRATOR_METHODS = ('_conduct_meeting_node', '_should_continue_meetings',
+                        '_president_synthesizes_node', '_build_sequential_graph',
+                        'deliberate_sequential', 'format_sequential_output')
+
+
+def _assert_methods(cls, names):
+    """Assert that cls defines or inherits every method in names."""
+    for name in names:
+        assert hasattr(cls, name), f"Missing {name} method"
+
+
 def test_imports():
     """Test that all modules can be imported."""
     print("Testing imports...")
 
-    try:
-        from agents.advisor_agent import AdvisorAgent
-        from agents.president_agent import PresidentAgent
-        from orchestrator import NSCOrchestrator, SequentialMeetingState
-        print("  ✓ All imports successful")
-        return True
-    except Exception as e:
-        print(f"  ✗ Import error: {e}")
+    if _IMPORT_ERROR is not None:
+        print(f"  ✗ Import error: {_IMPORT_ERROR}")
         return False
 
+    print("  ✓ All imports successful")
+    return True
+
 
 def test_agent_methods():
     """Test that new agent methods exist."""
     print("\nTesting agent methods...")
 
     try:
-        from agents.advisor_agent import AdvisorAgent
-        from agents.president_agent import PresidentAgent
-
         # Check AdvisorAgent methods
-        assert hasattr(AdvisorAgent, 'present_problems'), "Missing present_problems method"
-        assert hasattr(AdvisorAgent, 'answer_question'), "Missing answer_question method"
+        _assert_methods(_MODS['AdvisorAgent'], ADVISOR_METHODS)
         print("  ✓ AdvisorAgent has new methods")
 
         # Check PresidentAgent methods
-        assert hasattr(PresidentAgent, 'select_problem_and_question'), "Missing select_problem_and_question method"
-        assert hasattr(PresidentAgent, 'synthesize_policy_document'), "Missing synthesize_policy_document method"
+        _assert_methods(_MODS['PresidentAgent'], PRESIDENT_METHODS)
         print("  ✓ PresidentAgent has new methods")
 
         return True
@@ -54,14 +77,7 @@ def test_orchestrator_methods():
     print("\nTesting orchestrator methods...")
 
     try:
-        from orchestrator import NSCOrchestrator
-
-        assert hasattr(NSCOrchestrator, '_conduct_meeting_node'), "Missing _conduct_meeting_node"
-        assert hasattr(NSCOrchestrator, '_should_continue_meetings'), "Missing _should_continue_meetings"
-        assert hasattr(NSCOrchestrator, '_president_synthesizes_node'), "Missing _president_synthesizes_node"
-        assert hasattr(NSCOrchestrator, '_build_sequential_graph'), "Missing _build_sequential_graph"
-        assert hasattr(NSCOrchestrator, 'deliberate_sequential'), "Missing deliberate_sequential"
-        assert hasattr(NSCOrchestrator, 'format_sequential_output'), "Missing format_sequential_output"
+        _assert_methods(_MODS['NSCOrchestrator'], ORCHESTRATOR_METHODS)
         print("  ✓ NSCOrchestrator has all sequential methods")
 
         return True
@@ -75,10 +91,8 @@ def test_state_definition():
     print("\nTesting state definition...")
 
     try:
-        from orchestrator import SequentialMeetingState
-
         # Check required fields exist in type hints
-        annotations = SequentialMeetingState.__annotations__
+        annotations = _MODS['SequentialMeetingState'].__annotations__
         required_fields = ['query', 'context', 'memories', 'advisor_order',
                           'current_meeting_index', 'completed_meetings',
                           'policy_document', 'audit_trail']
@@ -98,9 +112,8 @@ def test_method_signatures():
     print("\nTesting method signatures...")
 
     try:
-        from agents.advisor_agent import AdvisorAgent
-        from agents.president_agent import PresidentAgent
-        import inspect
+        AdvisorAgent = _MODS['AdvisorAgent']
+        PresidentAgent = _MODS['PresidentAgent']
 
         # Test present_problems signature
         sig = inspect.signature(AdvisorAgent.present_problems)